@@ -1,28 +1,71 @@
 import os
 import json
 import shutil
-from datetime import datetime
+import time
+import hashlib
+import heapq
+import mmap
+import tarfile
 import tkinter as tk
 from tkinter import messagebox, simpledialog, filedialog
 from tkinter import ttk
 import threading
+import queue
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 try:
     from mega import Mega
     _HAVE_MEGA = True
 except Exception:
     Mega = None
     _HAVE_MEGA = False
+try:
+    from mega.errors import RequestError as MegaRequestError
+except Exception:
+    MegaRequestError = Exception
 import tempfile
 import traceback
 try:
-    import pystray
-    from PIL import Image, ImageDraw
-    _HAVE_PYSTRAY = True
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+try:
+    import blake3  # optional, faster content hashing
+    _HAVE_BLAKE3 = True
+except Exception:
+    blake3 = None
+    _HAVE_BLAKE3 = False
+try:
+    import orjson  # optional, faster JSON for manifests and config reads
+    _HAVE_ORJSON = True
+except Exception:
+    orjson = None
+    _HAVE_ORJSON = False
+try:
+    import zstandard  # optional, used for compressed cloud uploads
+    _HAVE_ZSTD = True
 except Exception:
-    pystray = None
-    Image = None
-    ImageDraw = None
-    _HAVE_PYSTRAY = False
+    zstandard = None
+    _HAVE_ZSTD = False
+# pystray loads a desktop backend (GTK/AppIndicator/Xlib) when imported, so
+# it is only imported the first time the tray is used; see _load_tray().
+pystray = None
+Image = None
+ImageDraw = None
+_HAVE_PYSTRAY = None  # unknown until _load_tray() runs
+
+def _load_tray():
+    """Import pystray and PIL on first use; return whether they are available."""
+    global pystray, Image, ImageDraw, _HAVE_PYSTRAY
+    if _HAVE_PYSTRAY is None:
+        try:
+            import pystray
+            from PIL import Image, ImageDraw
+            _HAVE_PYSTRAY = True
+        except Exception:
+            pystray = Image = ImageDraw = None
+            _HAVE_PYSTRAY = False
+    return _HAVE_PYSTRAY
 
 try:
     import ttkbootstrap as ttkb  # optional modern theme
@@ -35,53 +78,527 @@ HOME = os.path.expanduser("~")
 CONFIG_DIR = os.path.join(HOME, ".gamesaves")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "gamesaves.json")
 BACKUP_ROOT = os.path.join(CONFIG_DIR, "backup")
+MANIFEST_ROOT = os.path.join(CONFIG_DIR, "manifests")
 LOG_FILE = os.path.join(CONFIG_DIR, "savesync.log")
 MEGA_CREDS = os.path.join(CONFIG_DIR, "mega_credentials.json")
+COPY_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+MEGA_WORKERS = 8
+BG_WORKERS = 4  # concurrent backup/restore jobs started from the UI
+LIST_CACHE_TTL = 60  # seconds a cloud listing is reused by "List Backups"
+MEGA_UPLOAD_ATTEMPTS = 3
+MEGA_SESSION_TTL = 1800  # seconds before a cached login is refreshed
+MTIME_TOLERANCE = 1.0  # seconds; absorbs coarse filesystem timestamps
+LOG_DRAIN_MS = 100  # max delay before queued log lines reach the UI
+EXIT_POLL_MS = 200  # how often exit checks whether background jobs are done
+ARCHIVE_ZSTD = "savesync.tar.zst"
+ARCHIVE_GZIP = "savesync.tar.gz"
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+def _json_loads(data):
+    return orjson.loads(data) if _HAVE_ORJSON else json.loads(data)
 
 def load_config():
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    with open(CONFIG_FILE, 'rb') as f:
+        return _json_loads(f.read())
+
+_CONFIG_CACHE = {'key': None, 'cfg': None}
+_CONFIG_LOCK = threading.Lock()
+
+def _config_snapshot():
+    """Return the parsed config, re-reading the file only when it changed.
+
+    The returned dict is shared between callers and must not be mutated;
+    use load_config() for a private copy.
+    """
+    st = os.stat(CONFIG_FILE)
+    key = (st.st_mtime_ns, st.st_size)
+    with _CONFIG_LOCK:
+        if _CONFIG_CACHE['key'] != key:
+            _CONFIG_CACHE['cfg'] = load_config()
+            _CONFIG_CACHE['key'] = key
+        return _CONFIG_CACHE['cfg']
 
 def save_config(cfg):
     os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(cfg, f, indent=4)
+    # Keep the indent: users edit gamesaves.json by hand.
+    data = json.dumps(cfg, indent=4).encode()
+    # Skip the rewrite when nothing changed.
+    try:
+        with open(CONFIG_FILE, 'rb') as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    with open(CONFIG_FILE, 'wb') as f:
+        f.write(data)
+    # Prime the snapshot that backup_game, the restore workers and the
+    # auto-backup check read, so a same-size rewrite within one mtime tick
+    # can't leave them on the old contents; decode a copy, cfg stays the
+    # caller's.
+    st = os.stat(CONFIG_FILE)
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE['cfg'] = _json_loads(data)
+        _CONFIG_CACHE['key'] = (st.st_mtime_ns, st.st_size)
+
+_MEGA_SESSION = {'m': None, 't': 0}
+_MEGA_LOCK = threading.Lock()
+
+def _serialize_api_requests(m):
+    """Make the shared client safe for the upload/download worker pools.
+
+    mega.py bumps a request sequence number on every API call without
+    locking; only that metadata call is serialized here, the bulk transfer
+    to the storage node still runs in parallel.
+    """
+    api_request = m._api_request
+    lock = threading.Lock()
+
+    def locked(*args, **kwargs):
+        with lock:
+            return api_request(*args, **kwargs)
+
+    m._api_request = locked
+
+def get_mega():
+    """Return a logged-in MEGA client, reusing a recent session if possible."""
+    with _MEGA_LOCK:
+        now = time.monotonic()
+        if _MEGA_SESSION['m'] is None or now - _MEGA_SESSION['t'] > MEGA_SESSION_TTL:
+            with open(MEGA_CREDS, 'rb') as f:
+                creds = _json_loads(f.read())
+            m = Mega().login(creds.get("email"), creds.get("password"))
+            _serialize_api_requests(m)
+            _MEGA_SESSION['m'] = m
+            _MEGA_SESSION['t'] = now
+        return _MEGA_SESSION['m']
+
+def reset_mega_session():
+    """Drop the cached MEGA session (e.g. after credentials change)."""
+    with _MEGA_LOCK:
+        _MEGA_SESSION['m'] = None
+        _MEGA_SESSION['t'] = 0
+
+def open_mega_tree():
+    """Return a MegaTree for the cached session.
+
+    The listing is the first request of every MEGA operation, so an expired
+    session shows up here; in that case log in again and retry once.
+    """
+    try:
+        return MegaTree(get_mega())
+    except MegaRequestError:
+        reset_mega_session()
+        return MegaTree(get_mega())
+
+def _scan_files(folder, rel=""):
+    """Yield (relpath, stat_result) for every file under folder.
+
+    Uses os.scandir so each entry is stat'ed once via the cached DirEntry.
+    Symlinks are followed like shutil.copytree does; entries that can't be
+    stat'ed (dangling links) and non-regular files are skipped.
+    """
+    with os.scandir(folder) as it:
+        for entry in it:
+            rel_path = os.path.join(rel, entry.name) if rel else entry.name
+            try:
+                if entry.is_dir():
+                    yield from _scan_files(entry.path, rel_path)
+                elif entry.is_file():
+                    yield rel_path, entry.stat()
+            except OSError:
+                continue
+
+def file_hash(path):
+    """Return a content hash of path, prefixed with the algorithm used."""
+    if _HAVE_BLAKE3:
+        algo, h = "blake3", blake3.blake3()
+    else:
+        algo, h = "blake2b", hashlib.blake2b()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                h.update(buf)
+    return f"{algo}:{h.hexdigest()}"
+
+def _backup_names(path):
+    """Return the timestamp folder names under path (unsorted).
+
+    Uses os.scandir so stray files are skipped via the cached d_type.
+    Raises FileNotFoundError if path does not exist.
+    """
+    with os.scandir(path) as it:
+        return [e.name for e in it if e.is_dir(follow_symlinks=False)]
+
+def _manifest_path(backup_dir):
+    rel = os.path.relpath(os.path.normpath(backup_dir), BACKUP_ROOT)
+    return os.path.join(MANIFEST_ROOT, rel + ".json")
+
+def manifest_entry(path, st=None):
+    """Return the [size, mtime, hash] manifest entry for one file."""
+    if st is None:
+        st = os.stat(path)
+    return [st.st_size, st.st_mtime, file_hash(path)]
+
+def write_manifest(backup_dir, manifest=None):
+    """Record relpath -> [size, mtime, hash] for a finished local backup.
+
+    Pass manifest when the entries were already collected during the copy;
+    otherwise backup_dir is scanned. The manifest lives under MANIFEST_ROOT
+    so the backup folder itself only ever contains save files.
+    """
+    if manifest is None:
+        manifest = {
+            rel: manifest_entry(os.path.join(backup_dir, rel), st)
+            for rel, st in _scan_files(backup_dir)
+        }
+    path = _manifest_path(backup_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if _HAVE_ORJSON:
+        data = orjson.dumps(manifest)
+    else:
+        data = json.dumps(manifest, separators=(',', ':')).encode()
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def _load_manifest(backup_dir):
+    try:
+        with open(_manifest_path(backup_dir), 'rb') as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def _count_files(folder):
+    """Count the files _scan_files would yield, without building stat results.
+
+    Plain entries are classified from d_type; only symlinks need a stat.
+    """
+    count = 0
+    with os.scandir(folder) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    count += _count_files(entry.path)
+                elif entry.is_file():
+                    count += 1
+            except OSError:
+                continue
+    return count
 
 def folder_differs(folder1, folder2):
-    for root, _, files in os.walk(folder1):
-        rel_root = os.path.relpath(root, folder1)
-        for file in files:
-            f1 = os.path.join(root, file)
-            f2 = os.path.join(folder2, rel_root, file)
-            if not os.path.exists(f2):
-                return True
-            if os.path.getsize(f1) != os.path.getsize(f2):
+    # Size is checked first; a size match with a different mtime falls back
+    # to comparing content hashes so touched-but-identical files don't
+    # trigger a new backup.
+    manifest = _load_manifest(folder2)
+    if manifest is not None:
+        # Compare the live tree against the recorded manifest; no second walk.
+        seen = 0
+        touched = False
+        for rel_path, st1 in _scan_files(folder1):
+            entry = manifest.get(rel_path)
+            if entry is None or st1.st_size != entry[0]:
                 return True
-            if int(os.path.getmtime(f1)) != int(os.path.getmtime(f2)):
+            if abs(st1.st_mtime - entry[1]) >= MTIME_TOLERANCE:
+                if len(entry) < 3 or file_hash(os.path.join(folder1, rel_path)) != entry[2]:
+                    return True
+                # Same content, new mtime: remember it so the file isn't
+                # hashed again on the next check.
+                entry[1] = st1.st_mtime
+                touched = True
+            seen += 1
+        if seen != len(manifest):
+            return True
+        if touched:
+            try:
+                write_manifest(folder2, manifest)
+            except OSError:
+                pass
+        return False
+
+    # Without a manifest, files that exist only in the backup would go
+    # unnoticed by the walk below; compare entry counts (no stat) first.
+    if _count_files(folder1) != _count_files(folder2):
+        return True
+    for rel_path, st1 in _scan_files(folder1):
+        f2 = os.path.join(folder2, rel_path)
+        try:
+            st2 = os.stat(f2)
+        except OSError:
+            return True
+        if st1.st_size != st2.st_size:
+            return True
+        if abs(st1.st_mtime - st2.st_mtime) >= MTIME_TOLERANCE:
+            if file_hash(os.path.join(folder1, rel_path)) != file_hash(f2):
                 return True
     return False
 
-def _get_child_folder_id(m, parent_id, name):
-    children = m.get_files_in_node(parent_id)
-    for nid, n in children.items():
-        if n['t'] == 1 and n['a']['n'] == name:
-            return nid
-    return None
+def _kernel_copy(fsrc, fdst):
+    """Copy file data without going through user space.
 
-def _ensure_child_folder(m, parent_id, name):
-    cid = _get_child_folder_id(m, parent_id, name)
-    if cid:
+    Tries a FICLONE reflink first, then os.copy_file_range. Raises OSError
+    when neither applies, or when copy_file_range stops short of the source
+    size (some FUSE/virtual filesystems report 0 bytes), so the caller can
+    fall back.
+    """
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            if not hasattr(os, "copy_file_range"):
+                raise
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("no in-kernel copy available")
+    size = os.fstat(fsrc.fileno()).st_size
+    copied = 0
+    while True:
+        n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30)
+        if not n:
+            break
+        copied += n
+    if copied != size:
+        raise OSError(f"copy_file_range copied {copied} of {size} bytes")
+
+def fast_copy(src, dst):
+    """Copy src to dst, preferring a copy-on-write clone or in-kernel copy.
+
+    Falls back to shutil.copy2 (which uses sendfile on Linux) when the
+    filesystem or platform supports neither. Metadata is preserved either way.
+    """
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            _kernel_copy(fsrc, fdst)
+        shutil.copystat(src, dst)
+        return dst
+    except OSError:
+        return shutil.copy2(src, dst)
+
+class MultithreadedCopier(ThreadPoolExecutor):
+    """Thread pool usable as shutil.copytree's copy_function.
+
+    copytree still creates directories serially; file copies are queued on
+    the pool. Errors are re-raised when the context manager exits.
+
+    With link_from=(src_root, prev_dir, prev_manifest), files whose size and
+    mtime match the previous backup's manifest are hard-linked from it
+    instead of copied; backups are never modified in place, so sharing the
+    inode is safe.
+    """
+    def __init__(self, max_workers=COPY_WORKERS, on_copied=None, link_from=None):
+        super().__init__(max_workers=max_workers)
+        self._futures = []
+        self._on_copied = on_copied
+        self._link_from = link_from
+
+    def _link_unchanged(self, src, dst):
+        """Hard-link dst from the previous backup; return its manifest entry or None."""
+        src_root, prev_dir, prev_manifest = self._link_from
+        rel = os.path.relpath(src, src_root)
+        entry = prev_manifest.get(rel)
+        if entry is None or len(entry) < 3:
+            return None
+        st = os.stat(src)
+        if st.st_size != entry[0] or st.st_mtime != entry[1]:
+            return None
+        try:
+            os.link(os.path.join(prev_dir, rel), dst)
+        except OSError:  # gone, other filesystem, or no hard links
+            return None
+        return list(entry)
+
+    def _copy_one(self, src, dst):
+        entry = self._link_unchanged(src, dst) if self._link_from else None
+        if entry is None:
+            fast_copy(src, dst)
+        if self._on_copied:
+            self._on_copied(dst, entry)
+
+    def copy(self, src, dst):
+        self._futures.append(self.submit(self._copy_one, src, dst))
+        return dst
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        if exc_type is None:
+            for fut in self._futures:
+                fut.result()
+        return False
+
+def copy_tree(src, dst, on_copied=None, link_from=None, dirs_exist_ok=False):
+    """Copy a directory tree using a pool of copy workers.
+
+    on_copied(dst_file, entry) is called from a worker as each file lands;
+    entry is the reused manifest entry when the file was hard-linked from
+    link_from=(prev_dir, prev_manifest), else None.
+    """
+    if link_from is not None:
+        link_from = (src,) + tuple(link_from)
+    with MultithreadedCopier(on_copied=on_copied, link_from=link_from) as copier:
+        shutil.copytree(src, dst, copy_function=copier.copy, dirs_exist_ok=dirs_exist_ok)
+
+def pack_tree(folder, out_dir):
+    """Pack folder into a single archive in out_dir and return its path.
+
+    Uses zstd when the zstandard package is available, gzip otherwise.
+    """
+    if _HAVE_ZSTD:
+        out = os.path.join(out_dir, ARCHIVE_ZSTD)
+        with open(out, 'wb') as fh, \
+                zstandard.ZstdCompressor(level=3).stream_writer(fh) as zw, \
+                tarfile.open(fileobj=zw, mode='w|') as tar:
+            for name in sorted(os.listdir(folder)):
+                tar.add(os.path.join(folder, name), arcname=name)
+    else:
+        out = os.path.join(out_dir, ARCHIVE_GZIP)
+        with tarfile.open(out, 'w:gz') as tar:
+            for name in sorted(os.listdir(folder)):
+                tar.add(os.path.join(folder, name), arcname=name)
+    return out
+
+def extract_archive(path, dest):
+    """Extract an archive created by pack_tree into dest."""
+    kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    if path.endswith(".zst"):
+        if not _HAVE_ZSTD:
+            raise RuntimeError("zstandard library not available; cannot extract " + os.path.basename(path))
+        with open(path, 'rb') as fh, \
+                zstandard.ZstdDecompressor().stream_reader(fh) as zr, \
+                tarfile.open(fileobj=zr, mode='r|') as tar:
+            tar.extractall(dest, **kwargs)
+    else:
+        with tarfile.open(path, 'r:gz') as tar:
+            tar.extractall(dest, **kwargs)
+
+def _replace_file(src, dst):
+    """Copy src over dst via a temp file, so dst is never seen half-written."""
+    tmp = f"{dst}.savesync-tmp"
+    fast_copy(src, tmp)
+    os.replace(tmp, dst)
+
+def sync_tree(src, dst):
+    """Make dst match src, rewriting only files whose size or mtime differ.
+
+    Copies keep the source mtime, so a previously restored, untouched file
+    compares equal and is left alone. Files and directories missing from
+    src are removed. Returns the number of files written.
+    """
+    wanted = dict(_scan_files(src))
+    existing = dict(_scan_files(dst)) if os.path.isdir(dst) else {}
+    for rel in existing.keys() - wanted.keys():
+        os.remove(os.path.join(dst, rel))
+    for root, dirs, _ in os.walk(src):
+        for d in dirs:
+            os.makedirs(os.path.join(dst, os.path.relpath(os.path.join(root, d), src)), exist_ok=True)
+    os.makedirs(dst, exist_ok=True)
+    for root, dirs, files in os.walk(dst, topdown=False):
+        if not os.path.isdir(os.path.join(src, os.path.relpath(root, dst))):
+            os.rmdir(root)
+
+    changed = [
+        rel for rel, st in wanted.items()
+        if rel not in existing
+        or existing[rel].st_size != st.st_size
+        or existing[rel].st_mtime_ns != st.st_mtime_ns
+    ]
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        for fut in [pool.submit(_replace_file, os.path.join(src, rel), os.path.join(dst, rel))
+                    for rel in changed]:
+            fut.result()
+    return len(changed)
+
+def discard_tree(path):
+    """Move a directory out of the way and delete it in the background.
+
+    The rename is O(1) on the same filesystem, so callers can immediately
+    reuse path. Falls back to a synchronous rmtree if the rename fails.
+    The deleter is not a daemon, so interpreter exit waits for it; trash
+    left by a crash is swept up the next time the same path is discarded.
+    """
+    path = os.path.normpath(path)
+    parent, name = os.path.split(path)
+    prefix = f"{name}.savesync-trash-"
+    try:
+        with os.scandir(parent or ".") as it:
+            stale = [e.path for e in it if e.name.startswith(prefix)]
+    except OSError:
+        stale = []
+    trash = f"{path}.savesync-trash-{os.urandom(4).hex()}"
+    try:
+        os.rename(path, trash)
+    except OSError:
+        shutil.rmtree(path)
+    else:
+        stale.append(trash)
+
+    def purge():
+        for t in stale:
+            shutil.rmtree(t, ignore_errors=True)
+    threading.Thread(target=purge).start()
+
+class MegaTree:
+    """In-memory view of one MEGA node listing.
+
+    Every find_path_descriptor/get_files_in_node call fetches the whole
+    node list again, so lookups are answered from a single m.get_files()
+    snapshot. Folders created or destroyed through the tree are applied to
+    it, keeping the snapshot current for the rest of the operation.
+    """
+    def __init__(self, m):
+        self.m = m
+        self.root_id = None
+        self._children = defaultdict(dict)  # parent_id -> {node_id: node}
+        self._folders = {}  # (parent_id, name) -> node_id
+        for nid, n in m.get_files().items():
+            self._children[n.get('p')][nid] = n
+            if n['t'] == 1:
+                self._folders[(n['p'], n['a']['n'])] = nid
+            elif n['t'] == 2:
+                self.root_id = nid  # Cloud Drive
+
+    def children(self, parent_id, node_type=None):
+        """Return [(node_id, node)] under parent_id, optionally of one type."""
+        return [(nid, n) for nid, n in self._children.get(parent_id, {}).items()
+                if node_type is None or n['t'] == node_type]
+
+    def folder(self, parent_id, name):
+        return self._folders.get((parent_id, name))
+
+    def find_path(self, path):
+        """Resolve a '/'-separated folder path below the Cloud Drive."""
+        current = self.root_id
+        for seg in path.split('/'):
+            if seg:
+                current = self.folder(current, seg)
+                if current is None:
+                    return None
+        return current
+
+    def ensure_folder(self, parent_id, name):
+        cid = self.folder(parent_id, name)
+        if cid:
+            return cid
+        created = self.m._mkdir(name, parent_id)
+        cid = created['f'][0]['h']
+        self._folders[(parent_id, name)] = cid
+        self._children[parent_id][cid] = {'h': cid, 'p': parent_id, 't': 1, 'a': {'n': name}}
         return cid
-    created = m._mkdir(name, parent_id)
-    return created['f'][0]['h']
 
-def _ensure_path(m, parent_id, rel_path):
-    current = parent_id
-    for seg in rel_path.replace(os.sep, '/').split('/'):
-        if not seg or seg == '.':
-            continue
-        current = _ensure_child_folder(m, current, seg)
-    return current
+    def ensure_path(self, parent_id, rel_path):
+        current = parent_id
+        for seg in rel_path.replace(os.sep, '/').split('/'):
+            if not seg or seg == '.':
+                continue
+            current = self.ensure_folder(current, seg)
+        return current
+
+    def destroy(self, node_id):
+        """Permanently delete a node; raises (tree unchanged) if MEGA refuses."""
+        self.m.destroy(node_id)
+        for parent, kids in self._children.items():
+            n = kids.pop(node_id, None)
+            if n is not None:
+                if n['t'] == 1:
+                    self._folders.pop((parent, n['a']['n']), None)
+                break
 
 
 class _Tooltip:
@@ -137,77 +654,230 @@ def attach_tooltip(widget, text):
     else:
         widget._tooltip_obj.set_text(text)
 
-def enforce_mega_retention(m, game_name, keep, log_callback):
+def pick_backup(parent, title, prompt, options):
+    """Show a modal Listbox of options and return the selected item (or None).
+
+    parent defaults to the Tk root window.
+    """
+    parent = parent or tk._default_root
+    sel = {"value": None}
+    win = tk.Toplevel(parent)
+    win.transient(parent)
+    win.title(title)
+    win.grab_set()
+    ttk.Label(win, text=prompt, wraplength=560).pack(padx=12, pady=(12, 6))
+    lb = tk.Listbox(win, height=min(12, max(3, len(options))), exportselection=False)
+    lb.insert("end", *options)
+    lb.pack(padx=12, pady=(0, 12), fill="both", expand=True)
+    lb.focus_set()
+
+    btn_frame = ttk.Frame(win)
+    btn_frame.pack(pady=(0, 12))
+    def on_ok():
+        sel_idx = lb.curselection()
+        if sel_idx:
+            sel["value"] = lb.get(sel_idx[0])
+        win.destroy()
+    def on_cancel():
+        win.destroy()
+
+    ttk.Button(btn_frame, text="OK", command=on_ok).pack(side="left", padx=6)
+    ttk.Button(btn_frame, text="Cancel", command=on_cancel).pack(side="left", padx=6)
+
+    parent.wait_window(win)
+    return sel["value"]
+
+def enforce_mega_retention(m, game_name, keep, log_callback, tree=None):
+    if tree is None:
+        tree = MegaTree(m)
     # Ensure SaveSync/game exists; if not, nothing to prune
-    root_id = m.get_node_by_type(2)[0]
-    savesync_id = _get_child_folder_id(m, root_id, 'SaveSync')
-    if not savesync_id:
-        return
-    game_id = _get_child_folder_id(m, savesync_id, game_name)
+    game_id = tree.find_path(f"SaveSync/{game_name}")
     if not game_id:
         return
 
-    nodes = m.get_files_in_node(game_id)
-    ts_folders = [(nid, n) for nid, n in nodes.items() if n['t'] == 1]
-    # Sort newest first by name (YYYY-MM-DD_HH-MM-SS sorts lexicographically)
-    ts_folders.sort(key=lambda x: x[1]['a']['n'], reverse=True)
+    ts_folders = tree.children(game_id, node_type=1)
+    # Newest by name (YYYY-MM-DD_HH-MM-SS sorts lexicographically)
+    kept = {nid for nid, _ in heapq.nlargest(keep, ts_folders, key=lambda x: x[1]['a']['n'])}
 
-    for nid, n in ts_folders[keep:]:
-        m.destroy(nid)
+    # One confirmed request per folder: a batched request only reports the
+    # first command's result, so a failed deletion would go unnoticed.
+    for nid, n in ts_folders:
+        if nid in kept:
+            continue
+        try:
+            tree.destroy(nid)
+        except Exception as e:
+            if log_callback:
+                log_callback(f"[!] Could not prune cloud backup {n['a']['n']}: {e}")
+            continue
         if log_callback:
             log_callback(f"[x] Pruned old cloud backup: {n['a']['n']}")
 
-def upload_to_mega(game_name, folder_path, log_callback):
-    creds_path = MEGA_CREDS
-    if not os.path.exists(creds_path):
-        log_callback("[!] MEGA credentials not found.")
-        return
-
-    if not _HAVE_MEGA:
-        log_callback("[!] python-mega library not available; cannot upload to MEGA.")
-        return
+def _upload_with_retry(m, local_file, dest):
+    """m.upload with exponential backoff (1s, 2s, ...) between attempts."""
+    for attempt in range(MEGA_UPLOAD_ATTEMPTS):
+        try:
+            return m.upload(local_file, dest=dest)
+        except Exception:
+            if attempt == MEGA_UPLOAD_ATTEMPTS - 1:
+                raise
+            time.sleep(2 ** attempt)
+
+class MegaUploader:
+    """Upload files from a local timestamp folder to SaveSync/<game>/<timestamp>.
+
+    The remote timestamp folder is resolved up front from a single listing.
+    submit() may be called from any thread as soon as a file exists locally;
+    uploads run on a pool and finish() waits for them and applies retention.
+    If the backup can't be completed, abort() removes the remote timestamp
+    folder so a partial backup is never offered for restore or counted by
+    retention.
+    """
+    def __init__(self, tree, game_name, folder_path):
+        self.m = tree.m
+        self.tree = tree
+        self.game_name = game_name
+        self.folder_path = folder_path
+        self.ts_name = os.path.basename(os.path.normpath(folder_path))
+        # Ensure SaveSync/game/timestamp hierarchy, resolved against a single
+        # folder listing rather than one RPC per path segment.
+        self.ts_id = self.tree.ensure_path(self.tree.root_id, f"SaveSync/{game_name}/{self.ts_name}")
+        self._dir_ids = {"": self.ts_id}
+        self._lock = threading.Lock()
+        self._errors = []
+        self._futures = {}
+        self._settled = False  # uploads complete, or folder already removed
+        self._pool = ThreadPoolExecutor(max_workers=MEGA_WORKERS)
+
+    def submit(self, local_file, rel_file=None):
+        if rel_file is None:
+            rel_file = os.path.relpath(local_file, self.folder_path)
+        rel_path, file = os.path.split(rel_file)
+        display_path = f"{self.game_name}/{self.ts_name}"
+        if rel_path:
+            display_path += f"/{rel_path}"
+        # Folder creation and tree updates stay serial.
+        with self._lock:
+            try:
+                if rel_path not in self._dir_ids:
+                    self._dir_ids[rel_path] = self.tree.ensure_path(self.ts_id, rel_path)
+                fut = self._pool.submit(_upload_with_retry, self.m, local_file, self._dir_ids[rel_path])
+            except Exception as e:
+                self._errors.append(e)
+                return
+            self._futures[fut] = (file, display_path)
 
-    try:
-        with open(creds_path) as f:
-            creds = json.load(f)
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
 
-        if not _HAVE_MEGA:
-            log_callback("[!] python-mega library not available; cannot upload to MEGA.")
+    def abort(self):
+        """Cancel pending uploads and delete the partial timestamp folder."""
+        self.close()
+        if self._settled:
             return
-        mega = Mega()
-        m = mega.login(creds["email"], creds["password"])
-
-        # Ensure SaveSync/game/timestamp hierarchy
-        root_id = m.get_node_by_type(2)[0]  # Cloud Drive
-        savesync_id = _ensure_child_folder(m, root_id, 'SaveSync')
-        game_folder_id = _ensure_child_folder(m, savesync_id, game_name)
-        ts_name = os.path.basename(os.path.normpath(folder_path))
-        ts_path = f"SaveSync/{game_name}/{ts_name}"
-        ts_id = m.find_path_descriptor(ts_path)
-        if not ts_id:
-            m.create_folder(ts_name, dest=game_folder_id)
-            ts_id = m.find_path_descriptor(ts_path)
-
-        for root, _, files in os.walk(folder_path):
-            rel_path = os.path.relpath(root, folder_path)
-            if rel_path == ".":
-                target_id = ts_id
-                display_path = f"{game_name}/{ts_name}"
-            else:
-                target_id = _ensure_path(m, ts_id, rel_path)
-                display_path = f"{game_name}/{ts_name}/{rel_path}"
-            for file in files:
-                local_file = os.path.join(root, file)
-                m.upload(local_file, dest=target_id)
+        self._settled = True
+        try:
+            self.tree.destroy(self.ts_id)
+        except Exception:
+            pass
+
+    def finish(self, log_callback):
+        try:
+            with self._lock:
+                futures = dict(self._futures)
+            for fut in as_completed(futures):
+                file, display_path = futures[fut]
+                fut.result()
                 log_callback(f"[↑] Uploaded {file} to MEGA:{display_path}")
+            if self._errors:
+                raise self._errors[0]
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self.close()
+        self._settled = True
 
-        log_callback(f"[✓] Uploaded {game_name} {ts_name} to MEGA.")
+        log_callback(f"[✓] Uploaded {self.game_name} {self.ts_name} to MEGA.")
 
         # Keep only latest 3 timestamped backups
-        enforce_mega_retention(m, game_name, keep=3, log_callback=log_callback)
+        enforce_mega_retention(self.m, self.game_name, keep=3, log_callback=log_callback,
+                               tree=self.tree)
 
+def _open_uploader(game_name, folder_path, log_callback):
+    """Return a MegaUploader, or None (after logging why) if MEGA is unusable."""
+    if not os.path.exists(MEGA_CREDS):
+        log_callback("[!] MEGA credentials not found.")
+        return None
+
+    if not _HAVE_MEGA:
+        log_callback("[!] python-mega library not available; cannot upload to MEGA.")
+        return None
+
+    try:
+        return MegaUploader(open_mega_tree(), game_name, folder_path)
     except Exception as e:
         log_callback(f"[!] MEGA upload failed: {e}")
+        return None
+
+def upload_to_mega(game_name, folder_path, log_callback, compress=False):
+    uploader = _open_uploader(game_name, folder_path, log_callback)
+    if uploader is None:
+        return
+
+    try:
+        if compress:
+            # One archive means one upload instead of one per save file.
+            temp_dir = tempfile.mkdtemp(prefix=f"{game_name}_upload_")
+            try:
+                archive = pack_tree(folder_path, temp_dir)
+                uploader.submit(archive, os.path.basename(archive))
+                uploader.finish(log_callback)
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        else:
+            for rel_file, _ in _scan_files(folder_path):
+                uploader.submit(os.path.join(folder_path, rel_file), rel_file)
+            uploader.finish(log_callback)
+    except Exception as e:
+        uploader.abort()
+        log_callback(f"[!] MEGA upload failed: {e}")
+
+def download_files(m, file_items, restore_to, log_callback):
+    """Download MEGA file nodes concurrently straight into restore_to.
+
+    Callers recreate restore_to first, so there is nothing to race with and
+    no temp folder or cross-device move afterwards. Archives are unpacked
+    in place. A failed file doesn't stop the others; RuntimeError is raised
+    once they are done so the restore isn't reported as complete.
+    """
+    failed = 0
+    with ThreadPoolExecutor(max_workers=MEGA_WORKERS) as pool:
+        # download expects a (id, dict) tuple
+        futures = {pool.submit(m.download, item, dest_path=restore_to): item[1]['a']['n']
+                   for item in file_items}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                fut.result()
+            except Exception as e:
+                # Don't leave a truncated save file behind.
+                try:
+                    os.remove(os.path.join(restore_to, name))
+                except OSError:
+                    pass
+                log_callback(f"[!] Failed to download {name}: {e}")
+                failed += 1
+                continue
+            if name in (ARCHIVE_ZSTD, ARCHIVE_GZIP):
+                archive = os.path.join(restore_to, name)
+                extract_archive(archive, restore_to)
+                os.remove(archive)
+                log_callback(f"[↓] Extracted {name} to {restore_to}")
+                continue
+            log_callback(f"[↓] Restored {name} to {restore_to}")
+    if failed:
+        raise RuntimeError(f"{failed} file(s) failed to download")
 
 def restore_from_mega(game_name, log_callback):
     creds_path = MEGA_CREDS
@@ -216,75 +886,54 @@ def restore_from_mega(game_name, log_callback):
         return
 
     try:
-        with open(creds_path) as f:
-            creds = json.load(f)
-
         if not _HAVE_MEGA:
             log_callback("[!] python-mega library not available.")
             return
-        mega = Mega()
-        m = mega.login(creds["email"], creds["password"])
+        # Fetch the node listing once and resolve everything from it.
+        tree = open_mega_tree()
+        m = tree.m
 
-        cloud_base_id = m.find_path_descriptor('SaveSync')
+        cloud_base_id = tree.folder(tree.root_id, 'SaveSync')
         if not cloud_base_id:
             log_callback("[!] SaveSync folder not found on MEGA.")
             return
 
-        game_folder_id = m.find_path_descriptor(f'SaveSync/{game_name}')
+        game_folder_id = tree.folder(cloud_base_id, game_name)
         if not game_folder_id:
             log_callback(f"[!] No backups found for {game_name} on MEGA.")
             return
 
         # Get folders under the game folder
-        nodes = m.get_files_in_node(game_folder_id)
-        subfolders = [(nid, n) for nid, n in nodes.items() if n['t'] == 1]
+        subfolders = tree.children(game_folder_id, node_type=1)
         subfolders.sort(key=lambda x: x[1].get('ts', 0), reverse=True)
         if not subfolders:
             log_callback(f"[!] No cloud backups available for {game_name}")
             return
 
         backup_names = [n['a']['n'] for _, n in subfolders]
-        selected = simpledialog.askstring(
-            "Restore from MEGA",
-            "Available cloud backups:\n" + "\n".join(backup_names) + "\n\nType backup name:"
-        )
+        selected = pick_backup(None, "Restore from MEGA", "Select a cloud backup to restore:", backup_names)
 
-        if not selected or selected not in backup_names:
+        if not selected:
             log_callback(f"[!] Invalid or cancelled cloud backup selection.")
             return
 
-        selected_id, selected_node = next((nid, n) for nid, n in subfolders if n['a']['n'] == selected)
+        selected_id, selected_node = subfolders[backup_names.index(selected)]
 
-        config = load_config()
+        config = _config_snapshot()
         restore_to = os.path.expanduser(config[game_name]['save_path'])
         if os.path.exists(restore_to):
-            shutil.rmtree(restore_to)
+            discard_tree(restore_to)
         os.makedirs(restore_to, exist_ok=True)
 
-        # use a secure temporary directory for downloads
-        temp_dir = tempfile.mkdtemp(prefix=f"{game_name}_{selected}_")
-        try:
-            files_map = m.get_files_in_node(selected_id)
-            file_items = [(fid, n) for fid, n in files_map.items() if n['t'] == 0]
-            for fid, fobj in file_items:
-                # download expects a (id, dict) tuple
-                m.download((fid, fobj), dest_path=temp_dir)
-                src = os.path.join(temp_dir, fobj['a']['n'])
-                dst = os.path.join(restore_to, fobj['a']['n'])
-                shutil.move(src, dst)
-                log_callback(f"[↓] Restored {fobj['a']['n']} to {restore_to}")
-        finally:
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
+        file_items = tree.children(selected_id, node_type=0)
+        download_files(m, file_items, restore_to, log_callback)
         log_callback(f"[✓] Cloud restore complete to {restore_to}")
     except Exception as e:
         log_callback(f"[!] MEGA restore failed: {e}")
 
 def backup_game(game_name, log_callback):
     try:
-        config = load_config()
+        config = _config_snapshot()
         game_info = config.get(game_name)
         if not game_info:
             log_callback(f"[!] Game '{game_name}' not in config.")
@@ -293,6 +942,7 @@ def backup_game(game_name, log_callback):
         settings = config.get("_settings", {})
         sync_local = settings.get("sync_local", True)
         sync_mega = settings.get("sync_mega", True)
+        compress = settings.get("compress_uploads", False)
 
         if not sync_local and not sync_mega:
             log_callback("[!] Both local and MEGA sync are disabled; skipping backup.")
@@ -303,26 +953,72 @@ def backup_game(game_name, log_callback):
             log_callback(f"[!] Save path not found: {src}")
             return
 
-        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        def copy_and_upload(dest, done_msg, link_from=None):
+            # Claim the folder first: a backup started in the same second
+            # fails here instead of writing into (or, on error, deleting)
+            # the other job's backup.
+            os.mkdir(dest)
+            # Per-file uploads start as each file is copied, so local and
+            # network I/O overlap. An archive needs the whole tree first.
+            uploader = None
+            if sync_mega and not compress:
+                uploader = _open_uploader(game_name, dest, log_callback)
+            # Manifest entries are collected as files land instead of
+            # re-walking (and re-hashing serially) the finished backup.
+            manifest = {} if sync_local else None
+
+            def on_copied(dst, entry):
+                if manifest is not None:
+                    manifest[os.path.relpath(dst, dest)] = entry or manifest_entry(dst)
+                if uploader:
+                    uploader.submit(dst)
+
+            try:
+                copy_tree(src, dest, on_copied=on_copied, link_from=link_from,
+                          dirs_exist_ok=True)
+            except Exception:
+                if uploader:
+                    uploader.abort()
+                # A half-copied folder without a manifest would otherwise
+                # become the newest backup (and restore deletes the rest).
+                # dest is ours: os.mkdir above would have failed otherwise.
+                shutil.rmtree(dest, ignore_errors=True)
+                raise
+            if sync_local:
+                write_manifest(dest, manifest)
+            log_callback(done_msg)
+            if uploader:
+                try:
+                    uploader.finish(log_callback)
+                except Exception as e:
+                    log_callback(f"[!] MEGA upload failed: {e}")
+            elif sync_mega and compress:
+                upload_to_mega(game_name, dest, log_callback, compress=True)
+
+        timestamp = time.strftime('%Y-%m-%d_%H-%M-%S')
         # If local sync is enabled, create persistent backup under BACKUP_ROOT.
         if sync_local:
             dest_parent = os.path.join(BACKUP_ROOT, game_name)
             os.makedirs(dest_parent, exist_ok=True)
             dest = os.path.join(dest_parent, timestamp)
-            shutil.copytree(src, dest)
-            log_callback(f"[✓] Backed up to {dest}")
+            # Unchanged files are hard-linked from the newest backup.
+            link_from = None
+            prev = max(_backup_names(dest_parent), default=None)
+            if prev:
+                prev_dir = os.path.join(dest_parent, prev)
+                prev_manifest = _load_manifest(prev_dir)
+                if prev_manifest:
+                    link_from = (prev_dir, prev_manifest)
             # Upload uses this persistent folder.
-            if sync_mega:
-                upload_to_mega(game_name, dest, log_callback)
+            copy_and_upload(dest, f"[✓] Backed up to {dest}", link_from)
         else:
-            # Local disabled: create a temporary folder, upload if MEGA enabled, then remove.
+            # Local disabled: stage a snapshot in a temporary folder (a quick
+            # reflink/kernel copy) so the uploads, which can take minutes,
+            # never read save files the game may be rewriting; then remove it.
             temp_parent = tempfile.mkdtemp(prefix=f"{game_name}_")
             try:
                 temp_dest = os.path.join(temp_parent, timestamp)
-                shutil.copytree(src, temp_dest)
-                log_callback(f"[✓] Created temporary backup for upload: {temp_dest}")
-                if sync_mega:
-                    upload_to_mega(game_name, temp_dest, log_callback)
+                copy_and_upload(temp_dest, f"[✓] Created temporary backup for upload: {temp_dest}")
             finally:
                 try:
                     shutil.rmtree(temp_parent)
@@ -337,15 +1033,14 @@ def restore_game(game_name, log_callback):
         log_callback(f"[!] No backups found for {game_name}")
         return
 
-    backups = sorted(os.listdir(backup_path), reverse=True)
+    backups = sorted(_backup_names(backup_path), reverse=True)
     if not backups:
         log_callback(f"[!] No backups available.")
         return
 
-    selected = simpledialog.askstring("Choose Backup",
-        f"Available backups:\n" + "\n".join(backups) + "\n\nType backup name:")
+    selected = pick_backup(None, "Choose Backup", "Select a backup to restore:", backups)
 
-    if not selected or selected in ("", None) or selected not in backups:
+    if not selected:
         log_callback(f"[!] Invalid or cancelled backup selection.")
         return
 
@@ -360,11 +1055,18 @@ def restore_game_selected(game_name, selected, log_callback):
             log_callback(f"[!] Selected backup not found: {full_backup_path}")
             return
 
-        config = load_config()
+        config = _config_snapshot()
         restore_to = os.path.expanduser(config[game_name]['save_path'])
-        if os.path.exists(restore_to):
-            shutil.rmtree(restore_to)
-        shutil.copytree(full_backup_path, restore_to)
+        try:
+            # Usually most files already match the backup; only rewrite the rest.
+            written = sync_tree(full_backup_path, restore_to)
+        except OSError:
+            # e.g. a file where the backup has a directory; start from scratch.
+            if os.path.exists(restore_to):
+                discard_tree(restore_to)
+            copy_tree(full_backup_path, restore_to)
+        else:
+            log_callback(f"[↓] Rewrote {written} changed file(s)")
         log_callback(f"[✓] Restored to {restore_to}")
     except Exception as e:
         log_callback(f"[!] Local restore failed: {e}")
@@ -375,15 +1077,11 @@ def _mega_get_backups(game_name):
         raise RuntimeError("MEGA credentials not found.")
     if not _HAVE_MEGA:
         raise RuntimeError("python-mega library not available.")
-    with open(MEGA_CREDS) as f:
-        creds = json.load(f)
-    mega = Mega()
-    m = mega.login(creds["email"], creds["password"])
-    game_folder_id = m.find_path_descriptor(f"SaveSync/{game_name}")
+    tree = open_mega_tree()
+    game_folder_id = tree.find_path(f"SaveSync/{game_name}")
     if not game_folder_id:
         return []
-    nodes = m.get_files_in_node(game_folder_id)
-    subfolders = [(nid, n) for nid, n in nodes.items() if n['t'] == 1]
+    subfolders = tree.children(game_folder_id, node_type=1)
     subfolders.sort(key=lambda x: x[1].get('ts', 0), reverse=True)
     return [(n['a']['n'], nid) for nid, n in subfolders]
 
@@ -393,37 +1091,20 @@ def restore_from_mega_by_id(game_name, node_id, log_callback):
         if not os.path.exists(MEGA_CREDS):
             log_callback("[!] MEGA credentials not found.")
             return
-        with open(MEGA_CREDS) as f:
-            creds = json.load(f)
         if not _HAVE_MEGA:
             log_callback("[!] python-mega library not available.")
             return
-        mega = Mega()
-        m = mega.login(creds["email"], creds["password"])
+        tree = open_mega_tree()
+        m = tree.m
 
-        config = load_config()
+        config = _config_snapshot()
         restore_to = os.path.expanduser(config[game_name]['save_path'])
         if os.path.exists(restore_to):
-            shutil.rmtree(restore_to)
+            discard_tree(restore_to)
         os.makedirs(restore_to, exist_ok=True)
 
-        temp_dir = tempfile.mkdtemp(prefix=f"{game_name}_restore_")
-        try:
-            files_map = m.get_files_in_node(node_id)
-            file_items = [(fid, n) for fid, n in files_map.items() if n['t'] == 0]
-            for fid, fobj in file_items:
-                m.download((fid, fobj), dest_path=temp_dir)
-                src = os.path.join(temp_dir, fobj['a']['n'])
-                dst = os.path.join(restore_to, fobj['a']['n'])
-                if os.path.exists(src):
-                    shutil.move(src, dst)
-                    log_callback(f"[↓] Restored {fobj['a']['n']} to {restore_to}")
-        finally:
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
-
+        file_items = tree.children(node_id, node_type=0)
+        download_files(m, file_items, restore_to, log_callback)
         log_callback(f"[✓] Cloud restore complete to {restore_to}")
     except Exception as e:
         log_callback(f"[!] MEGA restore failed: {e}")
@@ -447,11 +1128,33 @@ class SaveSyncApp(tk.Tk):
 
         self.config = load_config()
 
+        # Workers only enqueue; the main loop drains the queue in batches and
+        # hands the text to a writer thread so file I/O stays off the UI.
+        self._log_queue = queue.SimpleQueue()
+        self._log_drain_pending = False
+        self._log_drain_lock = threading.Lock()
+        self._log_file_queue = queue.SimpleQueue()
+        self._log_writer = threading.Thread(target=self._write_log_file, daemon=True)
+        self._log_writer.start()
+
+        # Backup/restore jobs share one bounded pool; the UI stays busy until
+        # the last job finishes.
+        self._bg_pool = ThreadPoolExecutor(max_workers=BG_WORKERS)
+        self._bg_jobs = 0
+        # (games, lines, expires) from the last cloud listing; dropped
+        # whenever this app uploads a backup. The generation keeps a listing
+        # that was in flight during an invalidation from being cached.
+        self._cloud_list_cache = None
+        self._cloud_list_gen = 0
+        # Games with an auto-backup queued or running (Tk thread only).
+        self._auto_backups_running = set()
+
         # Sync toggles (persisted under _settings in config)
         settings = self.config.get("_settings", {})
         self.sync_local_var = tk.BooleanVar(value=settings.get("sync_local", True))
         self.sync_mega_var = tk.BooleanVar(value=settings.get("sync_mega", True))
         self.minimize_tray_var = tk.BooleanVar(value=settings.get("minimize_to_tray", False))
+        self.compress_uploads_var = tk.BooleanVar(value=settings.get("compress_uploads", False))
 
         self._init_styles()
         self._build_layout()
@@ -480,9 +1183,35 @@ class SaveSyncApp(tk.Tk):
 
     def on_exit(self):
         self.log("[*] Performing auto-sync and exiting SaveSync GUI.")
-        self.check_and_auto_backup()
+        try:
+            self.check_and_auto_backup()
+        except Exception as e:
+            self.log(f"[!] Auto-sync on exit failed: {e}")
+        self._destroy_when_idle()
+
+    def _destroy_when_idle(self):
+        # Hide the window but keep the Tk loop (and the interpreter) alive
+        # until running jobs such as the exit-time backup have finished;
+        # exiting earlier would abort their nested copy/upload pools.
+        try:
+            self.withdraw()
+        except Exception:
+            pass
+        if self._bg_jobs:
+            self.after(EXIT_POLL_MS, self._destroy_when_idle)
+            return
         self.destroy()
 
+    def destroy(self):
+        self._bg_pool.shutdown(wait=True)
+        try:
+            self._drain_log_queue()
+            self._log_file_queue.put(None)
+            self._log_writer.join(timeout=2)
+        except Exception:
+            pass
+        super().destroy()
+
     def _build_layout(self):
         content = ttk.Frame(self, padding=16)
         content.pack(fill="both", expand=True)
@@ -652,24 +1381,54 @@ class SaveSyncApp(tk.Tk):
             pass
 
     def log(self, message):
-        def do():
-            timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
-            full_msg = f"{timestamp} {message}"
-            self.status.config(text=message)
+        timestamp = time.strftime("[%Y-%m-%d %H:%M:%S]")
+        self._log_queue.put((message, f"{timestamp} {message}"))
+        # Schedule one drain per burst; an idle app gets no timer wakeups.
+        with self._log_drain_lock:
+            if self._log_drain_pending:
+                return
+            self._log_drain_pending = True
+        try:
+            self.after(LOG_DRAIN_MS, self._drain_log_queue)
+        except Exception:
+            pass  # window already destroyed
+
+    def _drain_log_queue(self):
+        """Apply all pending log lines with one widget update and one write."""
+        with self._log_drain_lock:
+            self._log_drain_pending = False
+        batch = []
+        try:
+            while True:
+                batch.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            text = "\n".join(full_msg for _, full_msg in batch) + "\n"
+            self.status.config(text=batch[-1][0])
             # Append to log view
             if hasattr(self, "log_text"):
                 self.log_text.configure(state="normal")
-                self.log_text.insert("end", full_msg + "\n")
+                self.log_text.insert("end", text)
                 self.log_text.see("end")
                 self.log_text.configure(state="disabled")
-            print(full_msg)
-            os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-            with open(LOG_FILE, "a") as f:
-                f.write(full_msg + "\n")
-        if threading.current_thread() is threading.main_thread():
-            do()
-        else:
-            self.after(0, do)
+            print(text, end="")
+            # Flush on outcomes; progress lines can wait for the buffer.
+            flush = any(msg.startswith(("[!]", "[✓]")) for msg, _ in batch)
+            self._log_file_queue.put((text, flush))
+
+    def _write_log_file(self):
+        """Writer thread: append drained batches to LOG_FILE until None arrives."""
+        os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+        with open(LOG_FILE, "a", buffering=8192) as f:
+            while True:
+                item = self._log_file_queue.get()
+                if item is None:
+                    return
+                text, flush = item
+                f.write(text)
+                if flush:
+                    f.flush()
 
     def reload_json(self):
         try:
@@ -692,37 +1451,15 @@ class SaveSyncApp(tk.Tk):
 
     def backup(self):
         game = self.game_var.get()
-        self.run_in_bg(lambda: backup_game(game, self.log))
+        # Dropped again when the upload and retention are done, so a listing
+        # taken meanwhile doesn't outlive the backup.
+        self._invalidate_cloud_list()
+        self.run_in_bg(lambda: backup_game(game, self.log),
+                       on_done=self._invalidate_cloud_list)
 
     def ask_selection(self, title, prompt, options):
         """Show a modal selection list and return the selected item (or None)."""
-        sel = {"value": None}
-        win = tk.Toplevel(self)
-        win.transient(self)
-        win.title(title)
-        win.grab_set()
-        ttk.Label(win, text=prompt, wraplength=560).pack(padx=12, pady=(12, 6))
-        lb = tk.Listbox(win, height=min(12, max(3, len(options))), exportselection=False)
-        for opt in options:
-            lb.insert("end", opt)
-        lb.pack(padx=12, pady=(0, 12), fill="both", expand=True)
-        lb.focus_set()
-
-        btn_frame = ttk.Frame(win)
-        btn_frame.pack(pady=(0, 12))
-        def on_ok():
-            sel_idx = lb.curselection()
-            if sel_idx:
-                sel["value"] = lb.get(sel_idx[0])
-            win.destroy()
-        def on_cancel():
-            win.destroy()
-
-        ttk.Button(btn_frame, text="OK", command=on_ok).pack(side="left", padx=6)
-        ttk.Button(btn_frame, text="Cancel", command=on_cancel).pack(side="left", padx=6)
-
-        self.wait_window(win)
-        return sel["value"]
+        return pick_backup(self, title, prompt, options)
 
     def restore(self):
         game = self.game_var.get()
@@ -730,7 +1467,7 @@ class SaveSyncApp(tk.Tk):
         if not os.path.exists(backup_path):
             self.log(f"[!] No backups found for {game}")
             return
-        backups = sorted(os.listdir(backup_path), reverse=True)
+        backups = sorted(_backup_names(backup_path), reverse=True)
         if not backups:
             self.log(f"[!] No backups available.")
             return
@@ -757,13 +1494,11 @@ class SaveSyncApp(tk.Tk):
             try:
                 pairs = _mega_get_backups(game)  # list of (name, node_id)
             except Exception as e:
-                self.after(0, lambda: self.log(f"[!] Could not list MEGA backups: {e}"))
-                self.after(0, lambda: self.set_busy(False))
+                self.log(f"[!] Could not list MEGA backups: {e}")
                 return
 
             if not pairs:
-                self.after(0, lambda: self.log(f"[!] No cloud backups available for {game}"))
-                self.after(0, lambda: self.set_busy(False))
+                self.log(f"[!] No cloud backups available for {game}")
                 return
 
             names = [n for n, _ in pairs]
@@ -780,85 +1515,88 @@ class SaveSyncApp(tk.Tk):
                 # Run the restore in background
                 self.run_in_bg(lambda: restore_from_mega_by_id(game, node_id, self.log))
             self.after(0, on_main)
-            self.after(0, lambda: self.set_busy(False))
 
-        self.set_busy(True)
-        threading.Thread(target=fetch_worker, daemon=True).start()
+        self.run_in_bg(fetch_worker)
 
     def list_backups(self):
         # Run listing in background to avoid blocking UI
         self.run_in_bg(self._list_backups_worker)
 
+    def _invalidate_cloud_list(self):
+        self._cloud_list_gen += 1
+        self._cloud_list_cache = None
+
+    def _cloud_listing(self, games):
+        """Return {game: [cloud lines]}, reusing a recent listing if possible."""
+        cached = self._cloud_list_cache
+        if cached and cached[0] == games and time.monotonic() < cached[2]:
+            return cached[1]
+        gen = self._cloud_list_gen
+        # One listing answers every game's lookup.
+        tree = open_mega_tree()
+        base = tree.find_path('SaveSync')
+        listing = {}
+        for game in games:
+            # find game folder under SaveSync
+            game_id = tree.folder(base, game) if base else None
+            ts_folders = tree.children(game_id, node_type=1) if game_id else []
+            # prefer lexicographic timestamp sorting (newest first)
+            ts_folders.sort(key=lambda x: x[1]['a']['n'], reverse=True)
+            if ts_folders:
+                listing[game] = [f"  (cloud) - {n['a']['n']}" for _, n in ts_folders]
+            else:
+                listing[game] = ["  (cloud) (no cloud backups)"]
+        if gen == self._cloud_list_gen:
+            self._cloud_list_cache = (games, listing, time.monotonic() + LIST_CACHE_TTL)
+        return listing
+
     def _list_backups_worker(self):
         lines = []
         settings = self.config.get("_settings", {})
         sync_local = settings.get("sync_local", True)
         sync_mega = settings.get("sync_mega", True)
+        if not sync_local and not sync_mega:
+            self.after(0, lambda: self._show_backup_message(
+                "Local and MEGA sync are both disabled; no backups to list."))
+            return
+        games = tuple(g for g in self.config if g != "_settings")
 
-        # Local backups
-        for game, info in self.config.items():
-            if game == "_settings":
-                continue
+        # Cloud backups via MEGA (if credentials present and enabled)
+        cloud = None
+        cloud_note = None
+        if not sync_mega:
+            cloud_note = "(cloud) MEGA sync is DISABLED."
+        elif not os.path.exists(MEGA_CREDS):
+            cloud_note = "(cloud) MEGA credentials not configured."
+        elif not _HAVE_MEGA:
+            cloud_note = "(cloud) python-mega library not installed; cannot list cloud backups."
+        else:
+            try:
+                cloud = self._cloud_listing(games)
+            except Exception as e:
+                cloud_note = f"(cloud) Unable to query MEGA: {e}"
+
+        # One block per game: local backups, then cloud backups
+        for game in games:
             lines.append(f"{game}:")
-            backup_dir = os.path.join(BACKUP_ROOT, game)
             if not sync_local:
                 lines.append("  (local) DISABLED")
             else:
-                if os.path.exists(backup_dir):
-                    items = sorted(os.listdir(backup_dir), reverse=True)
-                    if items:
-                        for b in items:
-                            lines.append(f"  (local) - {b}")
-                    else:
-                        lines.append("  (local) (no local backups)")
+                try:
+                    items = sorted(_backup_names(os.path.join(BACKUP_ROOT, game)), reverse=True)
+                except FileNotFoundError:
+                    items = []
+                if items:
+                    for b in items:
+                        lines.append(f"  (local) - {b}")
                 else:
                     lines.append("  (local) (no local backups)")
+            if cloud is not None:
+                lines.extend(cloud[game])
             lines.append("")  # blank line between games
 
-        # Cloud backups via MEGA (if credentials present and enabled)
-        if not sync_mega:
-            lines.append("(cloud) MEGA sync is DISABLED.")
-            lines.append("")
-        else:
-            if os.path.exists(MEGA_CREDS):
-                try:
-                    with open(MEGA_CREDS) as f:
-                        creds = json.load(f)
-                    if not _HAVE_MEGA:
-                        lines.append("(cloud) python-mega library not installed; cannot list cloud backups.")
-                        lines.append("")
-                    else:
-                        mega = Mega()
-                        m = mega.login(creds.get("email"), creds.get("password"))
-                        # Ensure SaveSync root exists
-                        base = m.find_path_descriptor('SaveSync')
-                        for game, _ in self.config.items():
-                            if game == "_settings":
-                                continue
-                            # find game folder under SaveSync
-                            game_id = m.find_path_descriptor(f"SaveSync/{game}")
-                            lines.append(f"{game} (cloud):")
-                            if not game_id:
-                                lines.append("  (cloud) (no cloud backups)")
-                                lines.append("")
-                                continue
-                            nodes = m.get_files_in_node(game_id)
-                            ts_folders = [(nid, n) for nid, n in nodes.items() if n['t'] == 1]
-                            # prefer lexicographic timestamp sorting (newest first)
-                            ts_folders.sort(key=lambda x: x[1]['a']['n'], reverse=True)
-                            if ts_folders:
-                                for _, n in ts_folders:
-                                    lines.append(f"  (cloud) - {n['a']['n']}")
-                            else:
-                                lines.append("  (cloud) (no cloud backups)")
-                            lines.append("")
-                except Exception as e:
-                    # Append error note for cloud listing
-                    lines.append(f"(cloud) Unable to query MEGA: {e}")
-                    lines.append("")
-            else:
-                lines.append("(cloud) MEGA credentials not configured.")
-                lines.append("")
+        if cloud_note:
+            lines.append(cloud_note)
 
         message = "\n".join(lines) if lines else "No games configured."
 
@@ -889,45 +1627,95 @@ class SaveSyncApp(tk.Tk):
             if b:
                 b.config(state=state)
         if busy:
-            self.progress.start(10)
+            self.progress.start(40)
         else:
             self.progress.stop()
 
-    def run_in_bg(self, fn):
-        def worker():
+    def run_in_bg(self, fn, on_done=None):
+        """Run fn on the job pool; on_done() is then called on the Tk thread."""
+        def done(fut):
+            exc = fut.exception()
+            if exc is not None:
+                self.log(f"[!] Background task failed: {exc}")
             try:
-                fn()
-            finally:
-                self.after(0, lambda: self.set_busy(False))
-        self.set_busy(True)
-        threading.Thread(target=worker, daemon=True).start()
+                self.after(0, self._bg_job_done, on_done)
+            except Exception:
+                pass  # window already destroyed
+        self._bg_jobs += 1
+        if self._bg_jobs == 1:
+            self.set_busy(True)
+        self._bg_pool.submit(fn).add_done_callback(done)
+
+    def _bg_job_done(self, on_done=None):
+        if on_done:
+            on_done()
+        self._bg_jobs -= 1
+        if not self._bg_jobs:
+            self.set_busy(False)
 
     def check_and_auto_backup(self):
         self.log("Checking for save changes...")
-        settings = self.config.get("_settings", {})
+        # Same view of gamesaves.json as the backup workers, so games added
+        # by hand are picked up without "Reload Config".
+        try:
+            config = _config_snapshot()
+        except (OSError, ValueError) as e:
+            self.log(f"[!] Could not read config, using the loaded one: {e}")
+            config = self.config
+        settings = config.get("_settings", {})
         if not settings.get("sync_local", True) and not settings.get("sync_mega", True):
             self.log("[!] Both local and MEGA sync disabled; skipping auto backups.")
             return
 
-        for game, info in self.config.items():
+        candidates = []
+        for game, info in config.items():
             if game == "_settings":
                 continue
+            # A backup still in flight would be compared half-written and
+            # queued a second time.
+            if game in self._auto_backups_running:
+                self.log(f"[=] Backup of {game} already in progress")
+                continue
             save_path = os.path.expanduser(info['save_path'])
             if not os.path.exists(save_path):
                 self.log(f"[!] Save path missing for {game}")
                 continue
 
+            # A missing backup folder just means there is no backup yet;
+            # backup_game creates it when needed.
             backup_path = os.path.join(BACKUP_ROOT, game)
-            os.makedirs(backup_path, exist_ok=True)
-            backups = sorted(os.listdir(backup_path), reverse=True)
-            latest_backup = os.path.join(backup_path, backups[0]) if backups else None
+            try:
+                latest = max(_backup_names(backup_path), default=None)
+            except FileNotFoundError:
+                latest = None
+            latest_backup = os.path.join(backup_path, latest) if latest else None
+            candidates.append((game, save_path, latest_backup))
 
-            if not latest_backup or folder_differs(save_path, latest_backup):
+        if not candidates:
+            return
+
+        def changed(item):
+            _, save_path, latest_backup = item
+            return not latest_backup or folder_differs(save_path, latest_backup)
+
+        # Games are independent, so compare their save trees concurrently.
+        with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as pool:
+            results = list(pool.map(changed, candidates))
+
+        for (game, _, _), differs in zip(candidates, results):
+            if differs:
                 self.log(f"[✓] Change detected in {game}, creating backup...")
-                self.run_in_bg(lambda g=game: backup_game(g, self.log))
+                self._invalidate_cloud_list()
+                self._auto_backups_running.add(game)
+                self.run_in_bg(lambda g=game: backup_game(g, self.log),
+                               on_done=lambda g=game: self._auto_backup_done(g))
             else:
                 self.log(f"[=] No changes in {game}")
 
+    def _auto_backup_done(self, game):
+        self._auto_backups_running.discard(game)
+        self._invalidate_cloud_list()
+
     # --- Tray and Options UI ---
     def show_options_window(self):
         win = tk.Toplevel(self)
@@ -948,10 +1736,16 @@ class SaveSyncApp(tk.Tk):
         btn_creds = ttk.Button(frm, text="Set MEGA Credentials", command=self.set_mega_credentials)
         btn_creds.grid(row=1, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
 
+        # Upload each backup as a single compressed archive
+        chk_compress = ttk.Checkbutton(frm, text="Compress cloud uploads into one archive",
+                                       variable=self.compress_uploads_var)
+        chk_compress.grid(row=2, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+
         # Save/Close
         def on_save():
             s = self.config.setdefault("_settings", {})
             s["minimize_to_tray"] = bool(self.minimize_tray_var.get())
+            s["compress_uploads"] = bool(self.compress_uploads_var.get())
             try:
                 save_config(self.config)
                 self.log("[✓] Options saved.")
@@ -961,7 +1755,7 @@ class SaveSyncApp(tk.Tk):
             win.destroy()
 
         btn_frame = ttk.Frame(frm)
-        btn_frame.grid(row=2, column=0, columnspan=2, pady=(12, 0))
+        btn_frame.grid(row=3, column=0, columnspan=2, pady=(12, 0))
         ttk.Button(btn_frame, text="Save", command=on_save).pack(side="left", padx=6)
         ttk.Button(btn_frame, text="Cancel", command=win.destroy).pack(side="left", padx=6)
 
@@ -978,13 +1772,22 @@ class SaveSyncApp(tk.Tk):
 
         try:
             os.makedirs(os.path.dirname(MEGA_CREDS), exist_ok=True)
-            with open(MEGA_CREDS, "w") as f:
+            # Write a private temp file and rename it over the old one, so a
+            # crash can't leave truncated JSON behind.
+            tmp = MEGA_CREDS + ".tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w") as f:
                 json.dump({"email": email, "password": password}, f, indent=4)
-            # restrict permissions
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, MEGA_CREDS)
+            # restrict permissions (the temp file may have pre-existed)
             try:
                 os.chmod(MEGA_CREDS, 0o600)
             except Exception:
                 pass
+            reset_mega_session()
+            self._invalidate_cloud_list()
             self.log("[✓] Saved MEGA credentials.")
             try:
                 self._update_mega_ui_state()
@@ -1048,15 +1851,15 @@ class SaveSyncApp(tk.Tk):
 
     def _start_tray(self):
         self.log("[Tray] _start_tray() called")
-        if not _HAVE_PYSTRAY:
+        if not _load_tray():
             self.log("[Tray] pystray not available; tray icon disabled.")
             return
         if getattr(self, 'tray_icon', None):
             self.log("[Tray] tray_icon already exists; skipping start.")
             return
 
-        # Build an icon image (fallback to a simple placeholder if possible)
-        img = self._make_tray_image()
+        # Build an icon image once (fallback to a simple placeholder if possible)
+        img = getattr(self, "_tray_img", None) or self._make_tray_image()
         if img is None:
             self.log("[Tray] _make_tray_image() returned None")
             if Image is not None:
@@ -1067,6 +1870,7 @@ class SaveSyncApp(tk.Tk):
                     self.log(f"[Tray] Failed to create placeholder image: {e}")
                     self.log(traceback.format_exc())
                     img = None
+        self._tray_img = img
 
         # Handlers (pystray expects signature (icon, item) for menu callbacks)
         def _on_restore(icon, item=None):
@@ -1208,7 +2012,7 @@ class SaveSyncApp(tk.Tk):
         finally:
             try:
                 self.log("[Tray] destroying main window")
-                self.destroy()
+                self._destroy_when_idle()
             except Exception as e:
                 self.log(f"[Tray] destroy() failed: {e}")
                 self.log(traceback.format_exc())